@@ -3,17 +3,50 @@
 Nacos HTTP API Client
 Used for directly calling Nacos REST API interfaces
 """
-import requests
+import asyncio
+import httpx
 import json
+import logging
 import os
 import sys
 from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin, urlencode
+from urllib.parse import urlencode
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables httpx's HTTP/2 support)
+    _HTTP2 = True
+except ImportError:  # fall back to HTTP/1.1 keep-alive
+    _HTTP2 = False
+
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse a raw response body, skipping charset detection"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON for form fields such as instance metadata"""
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
 
 
 class NacosAPIClient:
     """Nacos HTTP API Client"""
     
+    # (connect, read) timeout in seconds
+    TIMEOUT = (3, 10)
+    
+    # Form encoding of booleans, indexed by the bool itself
+    _BOOL_STR = ('false', 'true')
+    
     def __init__(self, base_url: str = "http://nacos.hyperagi.network", 
                  username: str = "", password: str = ""):
         """
@@ -25,55 +58,142 @@ class NacosAPIClient:
             password: Password (optional)
         """
         self.base_url = base_url.rstrip('/')
+        
+        # Endpoint URLs are fixed: concatenate once instead of urljoin per request
+        self._url_instance_list = self.base_url + '/nacos/v1/ns/instance/list'
+        self._url_service = self.base_url + '/nacos/v1/ns/service'
+        self._url_instance = self.base_url + '/nacos/v1/ns/instance'
+        self._url_beat = self.base_url + '/nacos/v1/ns/instance/beat'
         self.username = username
         self.password = password
-        self.session = requests.Session()
-        
-        # Set default timeout
-        self.session.timeout = 10
         
-        # If authentication info is provided, set authentication
-        if username and password:
-            self.session.auth = (username, password)
+        # One long-lived client for the whole process: over HTTPS the calls
+        # multiplex on a single HTTP/2 connection (HPACK-compressed headers,
+        # one TLS handshake); plain http:// stays on HTTP/1.1 keep-alive
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=_HTTP2,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+            ),
+            headers={
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'User-Agent': 'NacosAPIClient/1.0'
+            },
+            # If authentication info is provided, set authentication
+            auth=(username, password) if username and password else None,
+            timeout=httpx.Timeout(self.TIMEOUT[1], connect=self.TIMEOUT[0]),
+        )
+        
+        # Async client is created on first use so it binds to the running event loop
+        self._ac = None
     
-    def _make_request(self, method: str, endpoint: str, params: Dict = None, 
-                     data: Dict = None, headers: Dict = None) -> requests.Response:
+    @property
+    def async_client(self) -> "httpx.AsyncClient":
+        """Shared httpx.AsyncClient with its own keep-alive pool (created lazily)"""
+        if self._ac is None:
+            self._ac = httpx.AsyncClient(
+                http2=_HTTP2,
+                headers=self.client.headers,
+                auth=self.client.auth,
+                timeout=self.client.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._ac
+    
+    def close(self) -> None:
+        """Close the sync client and its pooled connections"""
+        self.client.close()
+    
+    async def aclose(self) -> None:
+        """Close the async client, if one was created"""
+        if self._ac is not None:
+            await self._ac.aclose()
+            self._ac = None
+    
+    def _make_request(self, method: str, url: str, params: Dict = None, 
+                     data: Dict = None, headers: Dict = None) -> httpx.Response:
         """
         Send HTTP request
         
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
-            endpoint: API endpoint
+            url: Full request URL (one of the precomputed endpoint URLs)
             params: URL parameters
             data: Request body data
             headers: Request headers
             
         Returns:
-            requests.Response: Response object
+            httpx.Response: Response object
         """
-        url = urljoin(self.base_url, endpoint)
-        
-        # Default request headers
-        default_headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'User-Agent': 'NacosAPIClient/1.0'
-        }
-        if headers:
-            default_headers.update(headers)
+        try:
+            return self.client.request(
+                method, url, params=params, data=data, headers=headers
+            )
+        except httpx.HTTPError as e:
+            logger.error("Request failed: %s", e)
+            raise
+    
+    async def _make_request_async(self, method: str, url: str, params: Dict = None,
+                                  data: Dict = None, headers: Dict = None) -> "httpx.Response":
+        """
+        Send HTTP request on the shared async client
         
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            url: Full request URL (one of the precomputed endpoint URLs)
+            params: URL parameters
+            data: Request body data
+            headers: Request headers
+            
+        Returns:
+            httpx.Response: Response object
+        """
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                data=data,
-                headers=default_headers
+            return await self.async_client.request(
+                method, url, params=params, data=data, headers=headers
             )
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {e}")
+        except httpx.HTTPError as e:
+            logger.error("Request failed: %s", e)
             raise
     
+    def _instance_list_params(self, service_name: str, group_name: str,
+                              namespace_id: str, healthy_only: bool) -> Dict[str, str]:
+        """Build query parameters for the instance list API"""
+        params = {
+            'serviceName': service_name,
+            'groupName': group_name
+        }
+        
+        if namespace_id:
+            params['namespaceId'] = namespace_id
+        
+        if healthy_only:
+            params['healthyOnly'] = 'true'
+        
+        logger.info("Getting service instance list: %s (group=%s, namespace=%s, healthy_only=%s)",
+                    service_name, group_name, namespace_id or 'default', healthy_only)
+        return params
+    
+    def _instance_list_result(self, response) -> Dict[str, Any]:
+        """Turn an instance list response into a result dict"""
+        logger.info("Request URL: %s, response status: %s", response.url, response.status_code)
+        logger.debug("Response headers: %s", response.headers)
+        
+        if response.status_code == 200:
+            try:
+                data = _json_loads(response.content)
+                logger.info("Request successful")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response content: %s", json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+                return data
+            except json.JSONDecodeError:
+                logger.warning("Response is not valid JSON format, raw response: %s", response.text)
+                return {'error': 'Invalid JSON response', 'raw': response.text}
+        else:
+            logger.error("Request failed: HTTP %s, error response: %s", response.status_code, response.text)
+            return {'error': f'HTTP {response.status_code}', 'message': response.text}
+    
     def get_service_instance_list(self, service_name: str, group_name: str = "DEFAULT_GROUP",
                                 namespace_id: str = "", healthy_only: bool = False) -> Dict[str, Any]:
         """
@@ -88,8 +208,32 @@ class NacosAPIClient:
         Returns:
             Dict: Response data containing instance list
         """
-        endpoint = "/nacos/v1/ns/instance/list"
+        url = self._url_instance_list
+        params = self._instance_list_params(service_name, group_name, namespace_id, healthy_only)
+        
+        try:
+            response = self._make_request('GET', url, params=params)
+            return self._instance_list_result(response)
+        except Exception as e:
+            logger.error("Request exception: %s", e)
+            return {'error': str(e)}
+    
+    async def get_service_instance_list_async(self, service_name: str, group_name: str = "DEFAULT_GROUP",
+                                              namespace_id: str = "", healthy_only: bool = False) -> Dict[str, Any]:
+        """Async variant of get_service_instance_list"""
+        url = self._url_instance_list
+        params = self._instance_list_params(service_name, group_name, namespace_id, healthy_only)
         
+        try:
+            response = await self._make_request_async('GET', url, params=params)
+            return self._instance_list_result(response)
+        except Exception as e:
+            logger.error("Request exception: %s", e)
+            return {'error': str(e)}
+    
+    def _service_detail_params(self, service_name: str, group_name: str,
+                               namespace_id: str) -> Dict[str, str]:
+        """Build query parameters for the service detail API"""
         params = {
             'serviceName': service_name,
             'groupName': group_name
@@ -98,39 +242,20 @@ class NacosAPIClient:
         if namespace_id:
             params['namespaceId'] = namespace_id
         
-        if healthy_only:
-            params['healthyOnly'] = 'true'
-        
-        print(f"🔍 Getting service instance list: {service_name}")
-        print(f"   Group: {group_name}")
-        print(f"   Namespace: {namespace_id or 'default'}")
-        print(f"   Show only healthy instances: {healthy_only}")
-        
-        try:
-            response = self._make_request('GET', endpoint, params=params)
-            
-            print(f"📡 Request URL: {response.url}")
-            print(f"📊 Response status: {response.status_code}")
-            print(f"📋 Response headers: {dict(response.headers)}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"✅ Request successful")
-                    print(f"📄 Response content: {json.dumps(data, indent=2, ensure_ascii=False)}")
-                    return data
-                except json.JSONDecodeError:
-                    print(f"⚠️  Response is not valid JSON format")
-                    print(f"📄 Raw response: {response.text}")
-                    return {'error': 'Invalid JSON response', 'raw': response.text}
-            else:
-                print(f"❌ Request failed: HTTP {response.status_code}")
-                print(f"📄 Error response: {response.text}")
-                return {'error': f'HTTP {response.status_code}', 'message': response.text}
-                
-        except Exception as e:
-            print(f"❌ Request exception: {e}")
-            return {'error': str(e)}
+        logger.info("Get service details: %s", service_name)
+        return params
+    
+    def _service_detail_result(self, response) -> Dict[str, Any]:
+        """Turn a service detail response into a result dict"""
+        if response.status_code == 200:
+            data = _json_loads(response.content)
+            logger.info("Service details retrieved successfully")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Service details: %s", json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+            return data
+        else:
+            logger.error("Get service details failed: HTTP %s, error response: %s", response.status_code, response.text)
+            return {'error': f'HTTP {response.status_code}', 'message': response.text}
     
     def get_service_detail(self, service_name: str, group_name: str = "DEFAULT_GROUP",
                           namespace_id: str = "") -> Dict[str, Any]:
@@ -145,33 +270,27 @@ class NacosAPIClient:
         Returns:
             Dict: Service detail data
         """
-        endpoint = "/nacos/v1/ns/service"
+        url = self._url_service
+        params = self._service_detail_params(service_name, group_name, namespace_id)
         
-        params = {
-            'serviceName': service_name,
-            'groupName': group_name
-        }
-        
-        if namespace_id:
-            params['namespaceId'] = namespace_id
-        
-        print(f"🔍 Get service details: {service_name}")
+        try:
+            response = self._make_request('GET', url, params=params)
+            return self._service_detail_result(response)
+        except Exception as e:
+            logger.error("Get service details exception: %s", e)
+            return {'error': str(e)}
+    
+    async def get_service_detail_async(self, service_name: str, group_name: str = "DEFAULT_GROUP",
+                                       namespace_id: str = "") -> Dict[str, Any]:
+        """Async variant of get_service_detail"""
+        url = self._url_service
+        params = self._service_detail_params(service_name, group_name, namespace_id)
         
         try:
-            response = self._make_request('GET', endpoint, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✅ Service details retrieved successfully")
-                print(f"📄 Service details: {json.dumps(data, indent=2, ensure_ascii=False)}")
-                return data
-            else:
-                print(f"❌ Get service details失败: HTTP {response.status_code}")
-                print(f"📄 Error response: {response.text}")
-                return {'error': f'HTTP {response.status_code}', 'message': response.text}
-                
+            response = await self._make_request_async('GET', url, params=params)
+            return self._service_detail_result(response)
         except Exception as e:
-            print(f"❌ Get service details异常: {e}")
+            logger.error("Get service details exception: %s", e)
             return {'error': str(e)}
     
     def register_instance(self, service_name: str, ip: str, port: int,
@@ -195,39 +314,38 @@ class NacosAPIClient:
         Returns:
             Dict: Registration result
         """
-        endpoint = "/nacos/v1/ns/instance"
+        url = self._url_instance
         
         data = {
             'serviceName': service_name,
             'ip': ip,
             'port': port,
             'groupName': group_name,
-            'healthy': str(healthy).lower(),
-            'enabled': str(enabled).lower(),
-            'ephemeral': str(ephemeral).lower()
+            'healthy': self._BOOL_STR[bool(healthy)],
+            'enabled': self._BOOL_STR[bool(enabled)],
+            'ephemeral': self._BOOL_STR[bool(ephemeral)]
         }
         
         if namespace_id:
             data['namespaceId'] = namespace_id
         
         if metadata:
-            data['metadata'] = json.dumps(metadata)
+            data['metadata'] = _json_dumps(metadata)
         
-        print(f"📝 Register service instance: {service_name} -> {ip}:{port}")
+        logger.info("Register service instance: %s -> %s:%s", service_name, ip, port)
         
         try:
-            response = self._make_request('POST', endpoint, data=data)
+            response = self._make_request('POST', url, data=data)
             
             if response.status_code == 200:
-                print(f"✅ Instance registered successfully")
+                logger.info("Instance registered successfully")
                 return {'success': True, 'message': 'Instance registered successfully'}
             else:
-                print(f"❌ Instance registration failed: HTTP {response.status_code}")
-                print(f"📄 Error response: {response.text}")
+                logger.error("Instance registration failed: HTTP %s, error response: %s", response.status_code, response.text)
                 return {'error': f'HTTP {response.status_code}', 'message': response.text}
                 
         except Exception as e:
-            print(f"❌ Instance registration exception: {e}")
+            logger.error("Instance registration exception: %s", e)
             return {'error': str(e)}
     
     def deregister_instance(self, service_name: str, ip: str, port: int,
@@ -245,7 +363,7 @@ class NacosAPIClient:
         Returns:
             Dict: Deregistration result
         """
-        endpoint = "/nacos/v1/ns/instance"
+        url = self._url_instance
         
         params = {
             'serviceName': service_name,
@@ -257,21 +375,20 @@ class NacosAPIClient:
         if namespace_id:
             params['namespaceId'] = namespace_id
         
-        print(f"🗑️  Deregister service instance: {service_name} -> {ip}:{port}")
+        logger.info("Deregister service instance: %s -> %s:%s", service_name, ip, port)
         
         try:
-            response = self._make_request('DELETE', endpoint, params=params)
+            response = self._make_request('DELETE', url, params=params)
             
             if response.status_code == 200:
-                print(f"✅ Instance deregistered successfully")
+                logger.info("Instance deregistered successfully")
                 return {'success': True, 'message': 'Instance deregistered successfully'}
             else:
-                print(f"❌ Instance deregistration failed: HTTP {response.status_code}")
-                print(f"📄 Error response: {response.text}")
+                logger.error("Instance deregistration failed: HTTP %s, error response: %s", response.status_code, response.text)
                 return {'error': f'HTTP {response.status_code}', 'message': response.text}
                 
         except Exception as e:
-            print(f"❌ Instance deregistration exception: {e}")
+            logger.error("Instance deregistration exception: %s", e)
             return {'error': str(e)}
     
     def send_heartbeat(self, service_name: str, ip: str, port: int,
@@ -291,7 +408,7 @@ class NacosAPIClient:
         Returns:
             Dict: Heartbeat result
         """
-        endpoint = "/nacos/v1/ns/instance/beat"
+        url = self._url_beat
         
         data = {
             'serviceName': service_name,
@@ -304,28 +421,40 @@ class NacosAPIClient:
             data['namespaceId'] = namespace_id
         
         if metadata:
-            data['metadata'] = json.dumps(metadata)
+            data['metadata'] = _json_dumps(metadata)
         
-        print(f"💓 Send heartbeat: {service_name} -> {ip}:{port}")
+        logger.info("Send heartbeat: %s -> %s:%s", service_name, ip, port)
         
         try:
-            response = self._make_request('PUT', endpoint, data=data)
+            response = self._make_request('PUT', url, data=data)
             
             if response.status_code == 200:
-                print(f"✅ Heartbeat sent successfully")
+                logger.info("Heartbeat sent successfully")
                 return {'success': True, 'message': 'Heartbeat sent successfully'}
             else:
-                print(f"❌ Heartbeat sending failed: HTTP {response.status_code}")
-                print(f"📄 Error response: {response.text}")
+                logger.error("Heartbeat sending failed: HTTP %s, error response: %s", response.status_code, response.text)
                 return {'error': f'HTTP {response.status_code}', 'message': response.text}
                 
         except Exception as e:
-            print(f"❌ Heartbeat sending exception: {e}")
+            logger.error("Heartbeat sending exception: %s", e)
             return {'error': str(e)}
 
 
+async def _fetch_demo_async(client: NacosAPIClient, service_name: str):
+    """Fetch instance list and service details concurrently on one async client"""
+    try:
+        return await asyncio.gather(
+            client.get_service_instance_list_async(service_name),
+            client.get_service_detail_async(service_name),
+        )
+    finally:
+        await client.aclose()
+
+
 def main():
     """Main function - demonstrate API calls"""
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
+    logging.getLogger('httpx').setLevel(logging.WARNING)
     print("🚀 Nacos HTTP API Client Demo")
     print("=" * 50)
     
@@ -344,10 +473,15 @@ def main():
     # Create API client
     client = NacosAPIClient(base_url, username, password)
     
+    # The two demo calls are independent: issue them concurrently
+    print("📋 Demo: Getting service instance list and service details")
+    print("-" * 30)
+    result, detail_result = asyncio.run(_fetch_demo_async(client, service_name))
+    print()
+    
     # Demo: Get service instance list
-    print("📋 Demo: Getting service instance list")
+    print("📋 Demo: Service instance list")
     print("-" * 30)
-    result = client.get_service_instance_list(service_name)
     
     if 'error' in result:
         print(f"❌ Failed to get instance list: {result['error']}")
@@ -366,7 +500,6 @@ def main():
     # 演示：Get service details
     print("📋 演示：Get service details")
     print("-" * 30)
-    detail_result = client.get_service_detail(service_name)
     
     if 'error' in detail_result:
         print(f"❌ Get service details失败: {detail_result['error']}")
@@ -4,22 +4,58 @@ import os
 import socket
 import threading
 import signal
-import inspect
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
+import itertools
+import functools
+import json
+import math
+import random
+import time
+from http.client import HTTPConnection, HTTPSConnection, BadStatusLine, HTTPException
+from urllib.parse import urlparse, urlencode, quote_plus
+
+from flask import Flask, Response
+from waitress import serve
+
+try:
+    import orjson
+except ImportError:  # optional fast path for /debug
+    orjson = None
 
-from flask import Flask, jsonify
-from nacos import NacosClient
-from eth_utils import is_address
+# -----------------------------
+# Process-wide DNS cache
+# -----------------------------
+# Reconnects to Nacos resolve the same host over and over; answer repeats from
+# memory for _DNS_CACHE_TTL seconds (the time bucket is part of the cache key), so a
+# moved server is still picked up. Also cleared whenever the connection is considered lost.
+_DNS_CACHE_TTL = 30
+_orig_getaddrinfo = socket.getaddrinfo
+
+@functools.lru_cache(maxsize=64)
+def _getaddrinfo_cache(host, port, family, type, proto, flags, _bucket):
+    return _orig_getaddrinfo(host, port, family, type, proto, flags)
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    # Copy: callers get their own list, as with the real getaddrinfo
+    return list(_getaddrinfo_cache(host, port, family, type, proto, flags,
+                                   int(time.monotonic() // _DNS_CACHE_TTL)))
+
+socket.getaddrinfo = _cached_getaddrinfo
 
 # -----------------------------
 # Logging
 # -----------------------------
+# LOG_LEVEL=DEBUG turns on the diagnostic output (environment, network and
+# per-server DNS/TCP details); LOG_FILE additionally writes the log to a file
+_log_handlers = [logging.StreamHandler()]
+if os.getenv("LOG_FILE"):
+    _log_handlers.append(logging.FileHandler(os.getenv("LOG_FILE"), encoding="utf-8"))
 logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s | %(levelname)s | %(threadName)s | %(message)s",
+    handlers=_log_handlers,
 )
+for _name in ("urllib3", "charset_normalizer"):
+    logging.getLogger(_name).setLevel(logging.WARNING)
 
 app = Flask(__name__)
 
@@ -32,6 +68,10 @@ NACOS_HTTP_TIMEOUT = float(os.getenv("NACOS_HTTP_TIMEOUT", "5.0"))
 
 PUBLIC_IP = os.getenv("PUBLIC_IP", "")
 PORT = int(os.getenv("PORT", 11434))  # Unified: both registration and Flask use it
+# HTTP side scales with threads inside this one process: extra processes would each
+# run their own supervisor and register the same (ip, port) again
+HTTP_THREADS = int(os.getenv("HTTP_THREADS", 4))
+HTTP_CONNECTION_LIMIT = int(os.getenv("HTTP_CONNECTION_LIMIT", 128))
 
 SERVICE_NAME = os.getenv("SERVICE_NAME", "")
 WALLET_ADDRESS = os.getenv("WALLET_ADDRESS", "")
@@ -44,18 +84,122 @@ NACOS_PASSWORD = os.getenv("NACOS_PASSWORD", "")
 MAX_RECONNECT_DELAY = int(os.getenv("MAX_RECONNECT_DELAY", 300))
 INITIAL_RECONNECT_DELAY = int(os.getenv("INITIAL_RECONNECT_DELAY", 5))
 HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", 5))
+# Upper bound on how long shutdown waits for the deregister call
+SHUTDOWN_DEREGISTER_TIMEOUT = float(os.getenv("SHUTDOWN_DEREGISTER_TIMEOUT", "2.0"))
+
+# Set to 0/false to skip the local port probe (waitress reports a busy port itself)
+PREFLIGHT_PORT_CHECK = os.getenv("PREFLIGHT_PORT_CHECK", "true").lower() not in ("0", "false", "no")
 
 # Optional: group/cluster (if server has routing policy)
 NACOS_GROUP = os.getenv("NACOS_GROUP", "DEFAULT_GROUP")
 NACOS_CLUSTER = os.getenv("NACOS_CLUSTER", "")
 
+# Instance identity and metadata never change after startup: encode the forms
+# once as ASCII strings so the hot paths skip urlencode's per-call quoting
+METADATA = {"walletAddress": WALLET_ADDRESS, "node": NODE}
+_METADATA_JSON = json.dumps(METADATA, separators=(",", ":"))
+
+def _instance_query(service_name: str) -> str:
+    query = (f"serviceName={quote_plus(service_name)}&ip={quote_plus(PUBLIC_IP)}"
+             f"&port={PORT}&groupName={quote_plus(NACOS_GROUP)}&ephemeral=true")
+    if NACOS_CLUSTER:
+        query += f"&clusterName={quote_plus(NACOS_CLUSTER)}"
+    return query
+
+_INSTANCE_QUERY = _instance_query(SERVICE_NAME)
+_REGISTER_BODY = (_INSTANCE_QUERY + "&metadata=" + quote_plus(_METADATA_JSON)
+                  + "&enabled=true&healthy=true").encode("ascii")
+
+# Heartbeat request is encoded once and sent verbatim every beat
+_BEAT_SERVICE_NAME = f"{NACOS_GROUP}@@{SERVICE_NAME}"
+_BEAT_INFO = {
+    "serviceName": _BEAT_SERVICE_NAME,
+    "ip": PUBLIC_IP,
+    "port": PORT,
+    "weight": 1.0,
+    "ephemeral": True,
+    "metadata": METADATA,
+}
+if NACOS_CLUSTER:
+    _BEAT_INFO["cluster"] = NACOS_CLUSTER
+HEARTBEAT_BODY = (_instance_query(_BEAT_SERVICE_NAME) + "&beat="
+                  + quote_plus(json.dumps(_BEAT_INFO, separators=(",", ":")))).encode("ascii")
+# No "Expect: 100-continue" is ever sent (http.client doesn't add one), so the
+# body goes out with the headers and a beat costs a single round trip
+HEARTBEAT_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Content-Length": str(len(HEARTBEAT_BODY)),
+    "Connection": "keep-alive",
+}
+
+# /health payload only varies by status: pre-encode both variants
+def _health_body(status: str) -> bytes:
+    return json.dumps({
+        "service": SERVICE_NAME,
+        "status": status,
+        "public_ip": PUBLIC_IP,
+        "port": PORT,
+        "node": NODE,
+        "nacos_server": NACOS_SERVER,
+        "group": NACOS_GROUP,
+        "cluster": NACOS_CLUSTER or "",
+    }).encode("utf-8")
+
+_HEALTH_UP = (_health_body("UP"), 200)
+_HEALTH_DEGRADED = (_health_body("DEGRADED"), 206)
+
 # -----------------------------
 # Global state
 # -----------------------------
-is_connected = False
+# Set/cleared only through _set_connected; readers call is_set() instead of
+# racing on a bare bool
+connected_event = threading.Event()
+_health = _HEALTH_DEGRADED  # swapped together with connected_event
 reconnect_lock = threading.Lock()
 stop_event = threading.Event()
-client = None  # type: NacosClient | None
+client = None  # type: NacosHTTPClient | None  (replaced only under reconnect_lock)
+# Written by the registering and heartbeat paths, read by /debug and shutdown:
+# go through _update_stats / stats_snapshot so no increment is lost or read torn
+_stats_lock = threading.Lock()
+connection_stats = {
+    "total_attempts": 0,
+    "successful_connections": 0,
+    "failed_connections": 0,
+    "last_success_time": None,
+    "last_error": None,
+    "heartbeat_success_count": 0,
+    "heartbeat_fail_count": 0,
+}
+
+# TCP options for every connection to Nacos: no Nagle delay, and dead peers are
+# detected after ~90s (60s idle + 3 probes x 10s) instead of the ~2h OS default
+NACOS_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+for _name, _value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+    if hasattr(socket, _name):  # not available on every platform
+        NACOS_SOCKET_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _name), _value))
+
+def _update_stats(*counters: str, **fields) -> None:
+    """Increment the named counters and set the given fields atomically"""
+    with _stats_lock:
+        for name in counters:
+            connection_stats[name] += 1
+        connection_stats.update(fields)
+
+def stats_snapshot() -> dict:
+    with _stats_lock:
+        return dict(connection_stats)
+
+def _set_connected(flag: bool) -> None:
+    """Update connected_event and the cached /health response in one place"""
+    global _health
+    if flag:
+        connected_event.set()
+    else:
+        connected_event.clear()
+    _health = _HEALTH_UP if flag else _HEALTH_DEGRADED
 
 # -----------------------------
 # Utilities: DNS & TCP checks
@@ -76,31 +220,34 @@ def _parse_host_port(server: str) -> tuple[str, int]:
     port = parsed.port or (80 if parsed.scheme in ("", "http") else 443)
     return host, port
 
-def check_dns_resolvable(host: str) -> bool:
+@functools.lru_cache(maxsize=32)
+def _resolve_once(host: str, port=None) -> tuple[list[str], str | None]:
+    """
+    Startup-time resolution shared by the diagnostics and preflight: returns
+    (addresses, error). Cached here (failures too), so it bypasses the process-wide cache.
+    """
     try:
-        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
-        addrs = sorted({x[4][0] for x in infos})
-        logging.info(f"DNS OK: {host} -> {addrs}")
-        return True
+        infos = _orig_getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+        return sorted({x[4][0] for x in infos}), None
     except Exception as e:
-        logging.error(f"DNS FAIL: {host} not resolvable: {e}")
-        return False
+        return [], str(e)
 
-def check_tcp_connect(host: str, port: int, timeout=3) -> bool:
-    try:
-        with socket.create_connection((host, port), timeout=timeout):
-            logging.info(f"TCP OK: {host}:{port} reachable")
-            return True
-    except Exception as e:
-        logging.error(f"TCP FAIL: {host}:{port} not reachable: {e}")
-        return False
+def check_dns_resolvable(host: str, port=None) -> bool:
+    addrs, err = _resolve_once(host, port)
+    if err is None:
+        logging.info(f"DNS OK: {host} -> {addrs}")
+        return True
+    logging.error(f"DNS FAIL: {host} not resolvable: {err}")
+    return False
 
 def check_port_available(port: int, host="0.0.0.0") -> bool:
     """Check if local listening port is available (not occupied)"""
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.bind((host, port))
-        s.close()
+        # Closed even when bind fails, so the probe never holds the port itself
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            # Don't report a port still in TIME_WAIT from a previous run as busy
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind((host, port))
         logging.info(f"PORT OK: {host}:{port} available for binding")
         return True
     except Exception as e:
@@ -112,35 +259,105 @@ def _build_base_url(server: str) -> str:
         return f"http://{server}"
     return server
 
-def _probe_nacos_http(server: str):
+# NACOS_SERVER (comma-separated) never changes after startup: split and parse it
+# once into (host, port, base_url) entries for preflight, diagnostics and failover
+PARSED_SERVERS = [
+    (*_parse_host_port(s), _build_base_url(s))
+    for s in (s.strip() for s in NACOS_SERVER.split(","))
+    if s
+]
+
+def _probe_nacos_http(c) -> bool:
     """
-    Lightweight HTTP probe:
+    Lightweight HTTP probe over the NacosHTTPClient `c`, also serving as the TCP
+    connectivity check:
     - First probe /nacos/v1/console/health
     - If 404, try /v1/console/health (some gateways don't have /nacos prefix)
-    Only log output, don't interrupt startup.
+    Stops at the first 2xx/3xx; redirects aren't followed and only the first
+    128 bytes of the body are read.
+    Returns False only if the server could not be reached at all;
+    any other status or error is just logged and doesn't interrupt startup.
     """
-    base = _build_base_url(server).rstrip("/")
+    base = _build_base_url(c.server).rstrip("/")
+    try:
+        c.connect()
+    except OSError as e:
+        logging.error(f"TCP FAIL: {base} not reachable: {e}")
+        return False
     for path in ("/nacos/v1/console/health", "/v1/console/health"):
         url = f"{base}{path}"
         try:
-            req = Request(url, method="GET")
-            with urlopen(req, timeout=NACOS_HTTP_TIMEOUT) as resp:
-                body = resp.read(128).decode("utf-8", errors="ignore")
-                logging.info(f"HTTP PROBE OK {url} status={resp.status} body={body}")
-                return
-        except HTTPError as e:
-            logging.warning(f"HTTP PROBE {url} HTTP {e.code}")
-        except URLError as e:
-            logging.warning(f"HTTP PROBE {url} error={e.reason}")
-        except Exception as e:
+            status, body = c.probe(path)
+        except Exception as e:  # connected, but slow (read timeout) or broken answer
             logging.warning(f"HTTP PROBE {url} error={e}")
+            continue
+        if status < 400:
+            logging.info(f"HTTP PROBE OK {url} status={status} body={body.decode('utf-8', errors='ignore')}")
+            return True
+        logging.warning(f"HTTP PROBE {url} HTTP {status}")
     logging.warning("HTTP PROBE failed on all known health endpoints")
+    return True
+
+# -----------------------------
+# Diagnostics (LOG_LEVEL=DEBUG)
+# -----------------------------
+def _masked_wallet() -> str | None:
+    return WALLET_ADDRESS[:10] + "..." + WALLET_ADDRESS[-6:] if WALLET_ADDRESS else None
+
+def log_environment_info():
+    logging.debug("Environment:")
+    logging.debug("   NACOS_SERVER: %s", NACOS_SERVER)
+    logging.debug("   PUBLIC_IP: %s", PUBLIC_IP)
+    logging.debug("   PORT: %s", PORT)
+    logging.debug("   SERVICE_NAME: %s", SERVICE_NAME)
+    logging.debug("   WALLET_ADDRESS: %s", _masked_wallet())
+    logging.debug("   NODE: %s", NODE)
+    logging.debug("   NACOS_GROUP: %s", NACOS_GROUP)
+    logging.debug("   NACOS_CLUSTER: %s", NACOS_CLUSTER or None)
+    logging.debug("   NACOS_USERNAME: %s", NACOS_USERNAME or None)
+    logging.debug("   NACOS_PASSWORD: %s", "***" if NACOS_PASSWORD else None)
+
+def log_network_info():
+    """Local host identity; port availability is covered by preflight_or_die"""
+    logging.debug("Network:")
+    try:
+        hostname = socket.gethostname()
+        logging.debug("   hostname: %s", hostname)
+        logging.debug("   local IP: %s", socket.gethostbyname(hostname))
+        logging.debug("   public IP: %s", PUBLIC_IP)
+    except Exception as e:
+        logging.error("   network info unavailable: %s", e)
+
+def log_nacos_server_info():
+    """DNS resolution and TCP reachability of every configured Nacos server"""
+    logging.debug("Nacos servers:")
+    for i, (host, port, base_url) in enumerate(PARSED_SERVERS, 1):
+        logging.debug("   server %d: %s", i, base_url)
+        addrs, err = _resolve_once(host, port)
+        if err is not None:
+            logging.error("     DNS FAIL: %s - %s", host, err)
+            continue
+        logging.debug("     DNS: %s -> %s", host, addrs)
+        try:
+            with socket.create_connection((host, port), timeout=3):
+                logging.debug("     TCP: %s:%s OK", host, port)
+        except Exception as e:
+            logging.warning("     TCP FAIL: %s:%s - %s", host, port, e)
 
 # -----------------------------
 # Validations
 # -----------------------------
+@functools.lru_cache(maxsize=1)
+def _validated_wallet(addr: str) -> bool:
+    """Checksum validation (keccak) runs once per distinct address"""
+    if not addr:
+        return False
+    # eth_utils (and its keccak backend) is slow to import and only needed here
+    from eth_utils import is_address
+    return is_address(addr)
+
 def validate_env_or_die():
-    if not WALLET_ADDRESS or not is_address(WALLET_ADDRESS):
+    if not _validated_wallet(WALLET_ADDRESS):
         raise ValueError("Invalid or empty WALLET_ADDRESS")
     if not PUBLIC_IP:
         raise ValueError("PUBLIC_IP is required")
@@ -148,207 +365,353 @@ def validate_env_or_die():
         raise ValueError("SERVICE_NAME is required")
 
 def preflight_or_die():
-    """Startup preflight check: DNS, TCP connectivity, port available + HTTP probe"""
-    first = NACOS_SERVER.split(",")[0].strip()
-    host, port = _parse_host_port(first)
+    """
+    Startup preflight check: one DNS lookup, then an HTTP probe (a response implies
+    TCP works), plus local port. The probe runs on a NacosHTTPClient that the first
+    create_nacos_client() call takes over, so registration reuses its connection
+    """
+    global _warm_client
+    if not PARSED_SERVERS:
+        raise RuntimeError("NACOS_SERVER is empty")
+    host, port, first = PARSED_SERVERS[0]
 
     ok = True
-    ok &= check_dns_resolvable(host)
-    ok &= check_tcp_connect(host, port)
-    ok &= check_port_available(PORT)
+    ok &= check_dns_resolvable(host, port)
+    if PREFLIGHT_PORT_CHECK:
+        ok &= check_port_available(PORT)
 
     logging.info(f"user server address  {NACOS_SERVER}")
-    _probe_nacos_http(first)
+    _warm_client = NacosHTTPClient(first, NACOS_HTTP_TIMEOUT)
+    ok &= _probe_nacos_http(_warm_client)
 
     if not ok:
         raise RuntimeError("Preflight checks failed. See logs above.")
 
 # -----------------------------
-# Nacos client helpers (+ ctor compatibility)
+# Nacos naming client (single persistent HTTP connection)
 # -----------------------------
-def _construct_nacos_client(servers: str) -> NacosClient:
-    """
-    Some nacos-sdk-python versions don't support default_timeout parameter, 
-    here we check the signature before passing it.
-    """
-    kwargs = {
-        "server_addresses": servers,
-        "namespace": "",
-        "username": NACOS_USERNAME,
-        "password": NACOS_PASSWORD,
-    }
-    sig = inspect.signature(NacosClient.__init__)
-    if "default_timeout" in sig.parameters:
-        kwargs["default_timeout"] = NACOS_HTTP_TIMEOUT
-    return NacosClient(**kwargs)
-
-def create_nacos_client() -> NacosClient:
-    logging.info(f"user server address  {NACOS_SERVER}")
-    # Support multiple addresses separated by commas; ensure each has protocol
-    servers = ",".join(_build_base_url(s.strip()) for s in NACOS_SERVER.split(",") if s.strip())
-    # Print init logs similar to SDK to help align with your existing log style
-    logging.info("[client-init] endpoint:None, tenant:")
-    return _construct_nacos_client(servers)
+_FORM_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Connection": "keep-alive",
+}
 
-# ---- Compatibility layer: automatically adapt parameter names for different SDK versions -----------------
-def _call_with_supported_kwargs(func, *args, **kwargs):
-    """
-    Read func signature, remove unsupported keys from kwargs;
-    Also automatically map 'enabled' to 'enable' (if exists).
-    """
-    sig = inspect.signature(func)
-    params = sig.parameters
+class _SocketOptionsMixin:
+    """Apply NACOS_SOCKET_OPTIONS once the connection (and TLS, if any) is up"""
+
+    def connect(self):
+        super().connect()
+        for level, option, value in NACOS_SOCKET_OPTIONS:
+            self.sock.setsockopt(level, option, value)
 
-    # Compatibility: enabled -> enable
-    if "enabled" in kwargs and "enable" in params:
-        kwargs["enable"] = kwargs.pop("enabled")
-    elif "enabled" in kwargs and "enable" not in params:
-        kwargs.pop("enabled")
+class _HTTPConnection(_SocketOptionsMixin, HTTPConnection):
+    pass
 
-    # If function doesn't have **kwargs, discard unsupported keys
-    accepts_varkw = any(p.kind == p.VAR_KEYWORD for p in params.values())
-    if not accepts_varkw:
-        kwargs = {k: v for k, v in kwargs.items() if k in params}
+class _HTTPSConnection(_SocketOptionsMixin, HTTPSConnection):
+    pass
 
-    return func(*args, **kwargs)
+class NacosHTTPError(RuntimeError):
+    """Non-200 answer from Nacos; the message never includes the access token"""
 
-def add_instance_compat(client, **kwargs):
-    return _call_with_supported_kwargs(client.add_naming_instance, **kwargs)
+    def __init__(self, method: str, path: str, status: int, data: bytes):
+        super().__init__(f"{method} {path} HTTP {status}: {data[:200]!r}")
+        self.status = status
+
+class NacosHTTPClient:
+    """
+    Minimal Nacos v1 naming client. The server URL is parsed once and one
+    keep-alive connection is reused for register / heartbeat / deregister,
+    instead of the SDK re-parsing the URL and looking up a pool per call.
+    """
 
-def send_heartbeat_compat(client, **kwargs):
-    return _call_with_supported_kwargs(client.send_heartbeat, **kwargs)
+    def __init__(self, server: str, timeout: float):
+        parsed = urlparse(_build_base_url(server))
+        conn_cls = _HTTPSConnection if parsed.scheme == "https" else _HTTPConnection
+        self.server = server
+        self._conn = conn_cls(parsed.hostname, parsed.port, timeout=timeout)
+        self._lock = threading.Lock()  # HTTPConnection is not thread-safe
+        self._credentials = None
+        self._token = ""
+        self._token_refresh_at = 0.0
+
+    def login(self, username: str, password: str) -> None:
+        """Fetch an accessToken; it is sent with every subsequent request and renewed before it expires"""
+        self._credentials = (username, password)
+        with self._lock:
+            self._login()
+
+    def _login(self) -> None:
+        # Caller holds self._lock
+        username, password = self._credentials
+        body = self._send_once("POST", "/nacos/v1/auth/login", "",
+                               urlencode({"username": username, "password": password}), _FORM_HEADERS)
+        data = json.loads(body)
+        self._token = data.get("accessToken", "")
+        # Renew at 90% of the TTL the server grants (Nacos defaults to 18000s)
+        self._token_refresh_at = time.monotonic() + 0.9 * float(data.get("tokenTtl", 18000))
+
+    def connect(self) -> None:
+        """Open the connection now if it isn't open (raises OSError if unreachable)"""
+        with self._lock:
+            if self._conn.sock is None:
+                self._conn.connect()
+
+    def probe(self, path: str, limit: int = 128) -> tuple[int, bytes]:
+        """GET path (no auth, redirects not followed); returns (status, first `limit` body bytes)"""
+        with self._lock:
+            try:
+                self._conn.request("GET", path, headers={"Connection": "keep-alive"})
+                resp = self._conn.getresponse()
+                data = resp.read(limit)
+            except (OSError, HTTPException):
+                self._conn.close()
+                raise
+            if not resp.isclosed():
+                # Body not fully read: the connection can't carry another request
+                self._conn.close()
+            return resp.status, data
+
+    def _query(self, extra: str = "") -> str:
+        params = [f"accessToken={quote_plus(self._token)}"] if self._token else []
+        if extra:
+            params.append(extra)
+        return "?" + "&".join(params) if params else ""
+
+    def _raw_request(self, method: str, path: str, form, headers=_FORM_HEADERS) -> bytes:
+        """
+        Send a form request; `form` is a dict or an already-encoded str/bytes
+        body. DELETE carries the form (then a str) in the query string.
+        """
+        body = form if isinstance(form, (bytes, str)) else urlencode(form)
+        extra = ""
+        if method == "DELETE":
+            extra, body = body, None
+        with self._lock:
+            if self._credentials and time.monotonic() >= self._token_refresh_at:
+                self._login()
+            try:
+                return self._send_once(method, path, self._query(extra), body, headers)
+            except NacosHTTPError as e:
+                if not self._credentials or e.status not in (401, 403):
+                    raise
+                # Token expired or was revoked server-side: log in again and retry once
+                logging.warning(f"{method} {path} HTTP {e.status}; renewing the access token")
+                self._login()
+                return self._send_once(method, path, self._query(extra), body, headers)
+
+    def _send_once(self, method: str, path: str, query: str, body, headers) -> bytes:
+        try:
+            return self._send(method, path, query, body, headers)
+        except (ConnectionError, BadStatusLine):
+            # Server dropped the idle keep-alive socket; redial once
+            self._conn.close()
+            return self._send(method, path, query, body, headers)
 
-def remove_instance_compat(client, **kwargs):
-    return _call_with_supported_kwargs(client.remove_naming_instance, **kwargs)
-# -----------------------------------------------------------
+    def _send(self, method: str, path: str, query: str, body, headers) -> bytes:
+        try:
+            self._conn.request(method, path + query, body, headers)
+            resp = self._conn.getresponse()
+            data = resp.read()
+        except (OSError, HTTPException):
+            # A failed send/read (e.g. a read timeout) leaves the connection mid-request,
+            # where every later request() raises CannotSendRequest; reset it first
+            self._conn.close()
+            raise
+        if resp.status != 200:
+            # path only: the query string carries the access token
+            raise NacosHTTPError(method, path, resp.status, data)
+        return data
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_server_index = itertools.count()
+_warm_client = None  # type: NacosHTTPClient | None  (probed by preflight_or_die, used once)
+
+def create_nacos_client() -> NacosHTTPClient:
+    global _warm_client
+    logging.info(f"user server address  {NACOS_SERVER}")
+    # Rotate through the configured servers on every (re)connect for failover
+    server = PARSED_SERVERS[next(_server_index) % len(PARSED_SERVERS)][2]
+    # Print init logs similar to SDK to help align with your existing log style
+    logging.info("[client-init] endpoint:None, tenant:")
+    c, _warm_client = _warm_client, None
+    if c is None or c.server != server:
+        if c is not None:
+            c.close()
+        c = NacosHTTPClient(server, NACOS_HTTP_TIMEOUT)
+    if NACOS_USERNAME and NACOS_PASSWORD:
+        c.login(NACOS_USERNAME, NACOS_PASSWORD)
+    return c
 
 def register_service() -> None:
-    """Try immediate registration (may throw error). Set is_connected=True on success"""
-    global is_connected
-    metadata = {"walletAddress": WALLET_ADDRESS, "node": NODE}
+    """Try immediate registration (may throw error). Set connected_event on success"""
 
     # Print pre-logs similar to SDK for easier troubleshooting
     logging.info(f"[add-naming-instance] ip:{PUBLIC_IP}, port:{PORT}, service_name:{SERVICE_NAME}, namespace:")
 
-    add_instance_compat(
-        client,
-        service_name=SERVICE_NAME,
-        ip=PUBLIC_IP,
-        port=PORT,
-        group_name=NACOS_GROUP,
-        cluster_name=(NACOS_CLUSTER or None),
-        metadata=metadata,
-        ephemeral=True,
-        enabled=True,   # Compatibility layer will automatically map/remove
-        healthy=True,
-    )
-    is_connected = True
+    try:
+        client._raw_request("POST", "/nacos/v1/ns/instance", _REGISTER_BODY)
+    except Exception as e:
+        _update_stats("total_attempts", "failed_connections", last_error=str(e))
+        raise
+    _set_connected(True)
+    _update_stats("total_attempts", "successful_connections",
+                  last_success_time=time.time(), last_error=None)
     logging.info(
         f"Registered: service={SERVICE_NAME} ip={PUBLIC_IP} port={PORT} "
-        f"group={NACOS_GROUP} cluster={NACOS_CLUSTER or '-'} meta={metadata}"
+        f"group={NACOS_GROUP} cluster={NACOS_CLUSTER or '-'} meta={METADATA}"
     )
 
 def attempt_reconnect_once() -> bool:
     """Reconnect/first connect once with lock; return True on success"""
-    global client, is_connected
+    global client
     with reconnect_lock:
         if stop_event.is_set():
             return False
         try:
-            logging.info(f"user server address  {NACOS_SERVER}")
-            client = create_nacos_client()
-            logging.info("[client-init] endpoint:None, tenant:")
+            old, client = client, create_nacos_client()
+            if old is not None:
+                old.close()  # don't leak the previous keep-alive socket
             register_service()
             return True
         except Exception as e:
-            is_connected = False
+            _set_connected(False)
+            _getaddrinfo_cache.cache_clear()  # the server may have moved
             logging.error(f"Reconnect/register failed: {e}")
             return False
 
-def backoff_delay(attempt: int) -> int:
-    return min(INITIAL_RECONNECT_DELAY * (2 ** max(0, attempt - 1)), MAX_RECONNECT_DELAY)
+# Past this exponent the delay is pinned at MAX_RECONNECT_DELAY anyway; capping it
+# keeps 2 ** n from growing without bound during a long outage
+_MAX_BACKOFF_EXP = (
+    max(0, math.ceil(math.log2(MAX_RECONNECT_DELAY / INITIAL_RECONNECT_DELAY)))
+    if 0 < INITIAL_RECONNECT_DELAY < MAX_RECONNECT_DELAY else 0
+)
 
-def reconnect_worker():
-    """Keep trying to connect until successful; wait for disconnection after connecting"""
-    attempt = 1
-    while not stop_event.is_set():
-        if not is_connected:
-            if attempt_reconnect_once():
-                logging.info("Connection established; normal operation resumes")
-                attempt = 1
-            else:
-                delay = backoff_delay(attempt)
-                logging.warning(f"Reconnect attempt #{attempt} failed. Retry in {delay}s ...")
-                attempt += 1
-                stop_event.wait(delay)
-        else:
-            stop_event.wait(HEARTBEAT_INTERVAL)
+def backoff_delay(attempt: int) -> float:
+    """
+    Exponential backoff with jitter: a uniformly random point in the upper half
+    of the window, so a fleet that lost Nacos together doesn't retry in lockstep
+    """
+    exp = min(max(0, attempt - 1), _MAX_BACKOFF_EXP)
+    delay = min(INITIAL_RECONNECT_DELAY * (2 ** exp), MAX_RECONNECT_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def heartbeat_delay(fail_count: int) -> float:
+    """
+    Interval until the next beat: ±0.5s jitter while healthy so many nodes don't
+    beat in lockstep; after failures the interval doubles per failure (capped at
+    60s), so a struggling server sees fewer beats, not more
+    """
+    if fail_count == 0:
+        return max(1, HEARTBEAT_INTERVAL + random.uniform(-0.5, 0.5))
+    return min(60, HEARTBEAT_INTERVAL * 2 ** fail_count)
 
-def heartbeat_worker():
-    """Heartbeat maintenance, consider disconnected after 3 consecutive failures"""
-    global is_connected
+def supervisor():
+    """
+    Single background loop replacing the separate reconnect/heartbeat threads:
+    while disconnected, (re)connect with exponential backoff;
+    while connected, heartbeat every ~HEARTBEAT_INTERVAL and
+    consider disconnected after 3 consecutive failures.
+    """
+    attempt = 1
     fail = 0
     while not stop_event.is_set():
-        if is_connected:
+        # Local copy: a concurrent reconnect may swap the global mid-iteration
+        c = client
+        if connected_event.is_set():
             try:
-                send_heartbeat_compat(
-                    client,
-                    service_name=SERVICE_NAME,
-                    ip=PUBLIC_IP,
-                    port=PORT,
-                    group_name=NACOS_GROUP,
-                    cluster_name=(NACOS_CLUSTER or None),
-                    metadata={"walletAddress": WALLET_ADDRESS, "node": NODE},
-                    ephemeral=True,
-                )
+                c._raw_request("PUT", "/nacos/v1/ns/instance/beat", HEARTBEAT_BODY, HEARTBEAT_HEADERS)
                 logging.info("Heartbeat OK")
+                _update_stats("heartbeat_success_count")
                 fail = 0
             except Exception as e:
                 fail += 1
-                logging.error(f"Heartbeat FAIL ({fail}): {e}")
+                _update_stats("heartbeat_fail_count")
+                logging.error("Heartbeat FAIL (%d): %s", fail, e)
                 if fail >= 3:
-                    is_connected = False
+                    _set_connected(False)
+                    _getaddrinfo_cache.cache_clear()
                     logging.warning("Marked disconnected due to repeated heartbeat failures")
                     fail = 0
-        stop_event.wait(HEARTBEAT_INTERVAL)
+            delay = heartbeat_delay(fail)
+        elif attempt_reconnect_once():
+            logging.info("Connection established; normal operation resumes")
+            attempt = 1
+            delay = heartbeat_delay(0)
+        else:
+            delay = backoff_delay(attempt)
+            logging.warning(f"Reconnect attempt #{attempt} failed. Retry in {delay:.1f}s ...")
+            attempt += 1
+        if stop_event.wait(delay):
+            break  # shutdown requested: don't sit out the rest of the delay
 
-def graceful_shutdown(*_args):
-    """SIGTERM/SIGINT graceful shutdown"""
-    logging.info("Shutting down ...")
-    stop_event.set()
-    # Regardless of is_connected status, try deregistration once
+def _deregister():
     try:
-        if client:
-            remove_instance_compat(
-                client,
-                service_name=SERVICE_NAME,
-                ip=PUBLIC_IP,
-                port=PORT,
-                group_name=NACOS_GROUP,
-                cluster_name=(NACOS_CLUSTER or None),
-                ephemeral=True,
-            )
+        c = client
+        if c:
+            c._raw_request("DELETE", "/nacos/v1/ns/instance", _INSTANCE_QUERY)
             logging.info("Deregistered from Nacos")
     except Exception as e:
         logging.error(f"Deregister failed: {e}")
 
+def graceful_shutdown(*_args):
+    """SIGTERM/SIGINT graceful shutdown (runs once; later calls are no-ops)"""
+    if stop_event.is_set():
+        return
+    logging.info("Shutting down ...")
+    stop_event.set()
+    # Regardless of connection status, try deregistration once. It runs on a daemon
+    # thread with a hard deadline: a hung Nacos call (or the supervisor holding the
+    # connection mid-request) must not hold up exit; the ephemeral instance expires anyway
+    t = threading.Thread(target=_deregister, name="deregister", daemon=True)
+    t.start()
+    t.join(SHUTDOWN_DEREGISTER_TIMEOUT)
+    if t.is_alive():
+        logging.warning(f"Deregister still pending after {SHUTDOWN_DEREGISTER_TIMEOUT}s; exiting anyway")
+    logging.info("Connection stats: %s", stats_snapshot())
+
+def _handle_signal(signum, _frame):
+    graceful_shutdown()
+    # waitress catches this in its serve loop, drains its worker threads and returns
+    raise SystemExit(0)
+
 # -----------------------------
 # Flask routes
 # -----------------------------
 @app.get("/health")
 def health():
-    return jsonify(
-        {
-            "service": SERVICE_NAME,
-            "status": "UP" if is_connected else "DEGRADED",
-            "public_ip": PUBLIC_IP,
-            "port": PORT,
-            "node": NODE,
-            "nacos_server": NACOS_SERVER,
-            "group": NACOS_GROUP,
-            "cluster": NACOS_CLUSTER or "",
-        }
-    ), (200 if is_connected else 206)
+    body, code = _health
+    return Response(body, status=code, mimetype="application/json")
+
+# Only connection_stats, is_connected and timestamp change between /debug hits
+_DEBUG_ENVIRONMENT = {
+    "NACOS_SERVER": NACOS_SERVER,
+    "PUBLIC_IP": PUBLIC_IP,
+    "PORT": PORT,
+    "SERVICE_NAME": SERVICE_NAME,
+    "WALLET_ADDRESS": _masked_wallet(),
+    "NODE": NODE,
+    "NACOS_GROUP": NACOS_GROUP,
+    "NACOS_CLUSTER": NACOS_CLUSTER,
+    "NACOS_USERNAME": NACOS_USERNAME or None,
+    "NACOS_PASSWORD": "***" if NACOS_PASSWORD else None,
+}
+
+def _json_bytes(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+@app.get("/debug")
+def debug():
+    body = _json_bytes({
+        "environment": _DEBUG_ENVIRONMENT,
+        "connection_stats": stats_snapshot(),
+        "is_connected": connected_event.is_set(),
+        "timestamp": time.time(),
+    })
+    return Response(body, status=200, mimetype="application/json")
 
 @app.get("/")
 def root():
@@ -358,28 +721,26 @@ def root():
 # Main
 # -----------------------------
 def main():
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        log_environment_info()
+        log_network_info()
+        log_nacos_server_info()
+
     validate_env_or_die()
     preflight_or_die()
 
     # Register signal handlers (Docker/K8s graceful shutdown)
-    signal.signal(signal.SIGINT, graceful_shutdown)
-    signal.signal(signal.SIGTERM, graceful_shutdown)
-
-    # Start background daemon threads first (initial registration is also handled by it)
-    threading.Thread(target=reconnect_worker, name="reconnector", daemon=True).start()
-    threading.Thread(target=heartbeat_worker, name="heartbeat", daemon=True).start()
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
 
-    # Optional: try immediate registration once (don't exit on failure, let background thread continue)
-    try:
-        global client
-        client = create_nacos_client()
-        logging.info("[client-init] endpoint:None, tenant:")
-        register_service()
-    except Exception as e:
-        logging.warning(f"Initial register failed; background will retry. reason={e}")
+    # The supervisor's first iteration sees the instance disconnected and performs
+    # the initial registration; there is no separate inline attempt to race with it
+    threading.Thread(target=supervisor, name="supervisor", daemon=True).start()
 
-    # Flask and registration port unified (must be consistent)
-    app.run(host="0.0.0.0", port=PORT)
+    # Flask and registration port unified (must be consistent).
+    # Served by waitress: a thread pool with HTTP keep-alive instead of the dev server
+    serve(app, host="0.0.0.0", port=PORT, threads=HTTP_THREADS,
+          connection_limit=HTTP_CONNECTION_LIMIT, channel_timeout=30)
 
 if __name__ == "__main__":
     try:
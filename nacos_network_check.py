@@ -5,64 +5,228 @@ Used for troubleshooting Nacos registration issues
 """
 import socket
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import sys
+import json
 from urllib.parse import urlparse
 import time
+import threading
+import functools
+import contextlib
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# One pooled keep-alive session for every request in this script
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers["Connection"] = "keep-alive"
+
+# VERBOSE=true also dumps full response headers
+VERBOSE = os.getenv("VERBOSE", "false").lower() in ("1", "true", "yes")
+
+# One lazily created pool shared by every fan-out in this script (servers, health endpoints)
+_MAX_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+_EXEC = None
+_exec_lock = threading.Lock()
+
+def _executor():
+    global _EXEC
+    if _EXEC is None:
+        with _exec_lock:
+            if _EXEC is None:
+                _EXEC = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="nacos-probe")
+    return _EXEC
+
+# Checks run on worker threads write through _emit: inside _captured() the lines are
+# collected per task and printed as one block, so concurrent output never interleaves
+_local = threading.local()
+
+def _emit(line=""):
+    buf = getattr(_local, "lines", None)
+    if buf is None:
+        print(line)
+    else:
+        buf.append(line)
+
+@contextlib.contextmanager
+def _section():
+    """
+    Collect everything emitted inside the block and write it with one stdout write
+    when the block ends; nested sections just add to the enclosing buffer
+    """
+    if getattr(_local, "lines", None) is not None:
+        yield
+        return
+    lines = _local.lines = []
+    try:
+        yield
+    finally:
+        _local.lines = None
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+
+def _batched(func):
+    """Run each call of func inside its own _section()"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _section():
+            return func(*args, **kwargs)
+    return wrapper
+
+def _captured(func, *args):
+    """Run func(*args) collecting its _emit output; returns (result, lines)"""
+    prev = getattr(_local, "lines", None)
+    lines = _local.lines = []
+    try:
+        return func(*args), lines
+    finally:
+        _local.lines = prev
+
+# Resolved addresses are reused for _DNS_TTL seconds (the time bucket is part of the cache key)
+_DNS_TTL = 30
+
+@functools.lru_cache(maxsize=64)
+def _resolve(host, _bucket):
+    try:
+        # Literal IPv4/IPv6 addresses need no resolver round trip
+        result = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM, flags=socket.AI_NUMERICHOST)
+    except socket.gaierror:
+        result = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP)
+    # Unique addresses in the resolver's preference order
+    return tuple(dict.fromkeys(x[4][0] for x in result))
+
+def _resolve_cached(host):
+    return _resolve(host, int(time.monotonic() // _DNS_TTL))
 
 def check_dns_resolution(host):
     """Check DNS resolution"""
-    print(f"🔍 Checking DNS resolution: {host}")
+    _emit(f"🔍 Checking DNS resolution: {host}")
     try:
-        result = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
-        ips = sorted({x[4][0] for x in result})
-        print(f"✅ DNS resolution successful: {host} -> {ips}")
+        ips = list(_resolve_cached(host))
+        _emit(f"✅ DNS resolution successful: {host} -> {ips}")
         return True, ips
     except Exception as e:
-        print(f"❌ DNS resolution failed: {host} - {e}")
+        _emit(f"❌ DNS resolution failed: {host} - {e}")
         return False, []
 
 def check_tcp_connection(host, port, timeout=5):
     """Check TCP connection"""
-    print(f"🔗 Checking TCP connection: {host}:{port}")
+    _emit(f"🔗 Checking TCP connection: {host}:{port}")
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        
-        if result == 0:
-            print(f"✅ TCP connection successful: {host}:{port}")
-            return True
-        else:
-            print(f"❌ TCP connection failed: {host}:{port} (error code: {result})")
+        # Reuse check_dns_resolution's cached lookup and try each address (IPv4 and IPv6)
+        error = OSError(f"{host} resolved to no addresses")
+        for ip in _resolve_cached(host):
+            try:
+                with socket.create_connection((ip, port), timeout=timeout):
+                    pass
+                return _report_tcp(host, port, 0)
+            except OSError as e:
+                error = e
+        raise error
+    except OSError as e:
+        if e.errno is None:  # e.g. timeout
+            _emit(f"❌ TCP connection exception: {host}:{port} - {e}")
             return False
-    except Exception as e:
-        print(f"❌ TCP connection exception: {host}:{port} - {e}")
+        return _report_tcp(host, port, e.errno)
+
+def _report_tcp(host, port, result):
+    if result == 0:
+        _emit(f"✅ TCP connection successful: {host}:{port}")
+        return True
+    else:
+        _emit(f"❌ TCP connection failed: {host}:{port} (error code: {result})")
         return False
 
+def probe_tcp_many(addrs, timeout=5):
+    """
+    Run check_tcp_connection for every (host, port) concurrently on the shared pool.
+    Returns {(host, port): (ok, output lines)}; total time is the slowest check, not the sum
+    """
+    addrs = list(dict.fromkeys(addrs))
+    results = _executor().map(lambda addr: _captured(check_tcp_connection, *addr, timeout), addrs)
+    return dict(zip(addrs, results))
+
 def check_http_endpoint(url, timeout=10):
     """Check HTTP endpoint"""
-    print(f"🌐 Checking HTTP endpoint: {url}")
+    _emit(f"🌐 Checking HTTP endpoint: {url}")
     try:
-        response = requests.get(url, timeout=timeout)
-        print(f"✅ HTTP request successful: {url} (status code: {response.status_code})")
-        print(f"   Response headers: {dict(response.headers)}")
-        if response.text:
-            print(f"   Response content: {response.text[:200]}...")
+        # Stream and read only a short preview: /nacos/ can return the whole console page
+        with _SESSION.get(url, timeout=timeout, stream=True) as response:
+            preview = next(response.iter_content(512), b'').decode('utf-8', 'replace')
+        _emit(f"✅ HTTP request successful: {url} (status code: {response.status_code})")
+        if VERBOSE:
+            _emit(f"   Response headers: {dict(response.headers)}")
+        if preview:
+            _emit(f"   Response content: {preview[:200]}...")
         return True, response
-    except requests.exceptions.Timeout:
-        print(f"⏰ HTTP request timeout: {url}")
-        return False, None
-    except requests.exceptions.ConnectionError as e:
-        print(f"❌ HTTP connection error: {url} - {e}")
-        return False, None
     except Exception as e:
-        print(f"❌ HTTP request exception: {url} - {e}")
-        return False, None
+        return _http_failed(url, e)
+
+def _http_failed(url, e):
+    if isinstance(e, requests.exceptions.Timeout):
+        _emit(f"⏰ HTTP request timeout: {url}")
+    elif isinstance(e, requests.exceptions.ConnectionError):
+        _emit(f"❌ HTTP connection error: {url} - {e}")
+    else:
+        _emit(f"❌ HTTP request exception: {url} - {e}")
+    return False, None
+
+def check_http_head(url, timeout=10):
+    """Check HTTP endpoint with HEAD (no body); falls back to GET if HEAD is not allowed"""
+    try:
+        response = _SESSION.head(url, timeout=timeout, allow_redirects=False)
+    except Exception as e:
+        _emit(f"🌐 Checking HTTP endpoint: {url}")
+        return _http_failed(url, e)
+    if response.status_code in (405, 501):
+        return check_http_endpoint(url, timeout)
+    
+    _emit(f"🌐 Checking HTTP endpoint: {url}")
+    _emit(f"✅ HTTP request successful: {url} (status code: {response.status_code}, HEAD)")
+    if VERBOSE:
+        _emit(f"   Response headers: {dict(response.headers)}")
+    return True, response
+
+def _exception_chain(exc):
+    """Yield exc and everything it wraps (cause/context, urllib3 .reason, args)"""
+    seen = set()
+    stack = [exc]
+    while stack:
+        e = stack.pop()
+        if e is None or id(e) in seen:
+            continue
+        seen.add(id(e))
+        yield e
+        stack.extend((e.__cause__, e.__context__, getattr(e, "reason", None)))
+        stack.extend(a for a in getattr(e, "args", ()) if isinstance(a, BaseException))
+
+def check_reachable(full_url, timeout=(2, 5)):
+    """
+    DNS + TCP + HTTP in a single request: any HTTP response means all three
+    work; on failure, the exception tells which stage broke
+    """
+    url = f"{full_url.rstrip('/')}/nacos/v1/console/health"
+    _emit(f"⚡ Checking reachability: {url}")
+    try:
+        response = _SESSION.get(url, timeout=timeout)
+        _emit(f"✅ DNS, TCP and HTTP OK: {url} (status code: {response.status_code})")
+        return True
+    except requests.exceptions.RequestException as e:
+        chain = list(_exception_chain(e))
+        if any(isinstance(x, socket.gaierror) for x in chain):
+            _emit(f"❌ DNS resolution failed: {url} - {e}")
+        elif isinstance(e, (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError)):
+            _emit(f"❌ TCP connection failed: {url} - {e}")
+        else:
+            _emit(f"❌ HTTP request failed: {url} - {e}")
+        return False
 
-def check_nacos_health_endpoints(base_url):
-    """Check Nacos health check endpoints"""
+def check_nacos_health_endpoints(base_url, timeout=10):
+    """Check Nacos health check endpoints (fallbacks probed concurrently)"""
     endpoints = [
         "/nacos/v1/console/health",
         "/v1/console/health", 
@@ -72,16 +236,28 @@ def check_nacos_health_endpoints(base_url):
         "/"
     ]
     
-    print(f"🏥 Checking Nacos health endpoints (base URL: {base_url})")
+    _emit(f"🏥 Checking Nacos health endpoints (base URL: {base_url})")
     success_count = 0
     
-    for endpoint in endpoints:
-        url = f"{base_url.rstrip('/')}{endpoint}"
-        success, response = check_http_endpoint(url)
-        if success:
-            success_count += 1
+    # One healthy endpoint is enough: probe the primary one alone and only fall back
+    # to the others (concurrently, total time is the slowest probe) if it fails
+    base = base_url.rstrip('/')
+    success, response = check_http_head(f"{base}{endpoints[0]}", timeout)
+    if success:
+        success_count = checked = 1
+    else:
+        futures = [_executor().submit(_captured, check_http_head, f"{base}{endpoint}", timeout)
+                   for endpoint in endpoints[1:]]
+        for future in as_completed(futures):
+            (success, response), lines = future.result()
+            for line in lines:
+                _emit(line)
+            if success:
+                success_count += 1
+        checked = len(endpoints)
     
-    print(f"📊 Health endpoint check result: {success_count}/{len(endpoints)} successful")
+    skipped = f" ({len(endpoints) - checked} skipped)" if checked < len(endpoints) else ""
+    _emit(f"📊 Health endpoint check result: {success_count}/{checked} successful{skipped}")
     return success_count > 0
 
 def get_nacos_instance_list(base_url, service_name="test", timeout=8):
@@ -91,57 +267,61 @@ def get_nacos_instance_list(base_url, service_name="test", timeout=8):
         "serviceName": service_name
     }
     
-    print(f"📋 Getting service instance list: {service_name}")
-    print(f"🌐 Request URL: {url}")
-    print(f"📝 Request parameters: {params}")
+    _emit(f"📋 Getting service instance list: {service_name}")
+    _emit(f"🌐 Request URL: {url}")
+    _emit(f"📝 Request parameters: {params}")
     
     try:
-        response = requests.get(url, params=params, timeout=timeout)
-        print(f"✅ Request successful (status code: {response.status_code})")
-        print(f"📄 Response headers: {dict(response.headers)}")
+        response = _SESSION.get(url, params=params, timeout=timeout)
+        _emit(f"✅ Request successful (status code: {response.status_code})")
+        _emit(f"📄 Response headers: {dict(response.headers)}")
         
-        if response.text:
-            print(f"📦 Response content:")
-            print(response.text)
+        raw = response.content
+        if raw:
+            text = raw.decode('utf-8', 'replace')
+            _emit(f"📦 Response content:")
+            _emit(text)
             
-            # Try to parse JSON response
+            # Try to parse JSON response (from the bytes already in hand, not a second decode)
             try:
-                data = response.json()
-                print(f"🔍 Parsed data: {data}")
+                data = json.loads(raw)
+                _emit(f"🔍 Parsed data: {data}")
                 return True, data
             except ValueError:
-                print("⚠️  Response is not valid JSON format")
-                return True, response.text
+                _emit("⚠️  Response is not valid JSON format")
+                return True, text
         else:
-            print("📭 Response content is empty")
+            _emit("📭 Response content is empty")
             return True, None
             
     except requests.exceptions.Timeout:
-        print(f"⏰ Request timeout: {url} (timeout: {timeout} seconds)")
+        _emit(f"⏰ Request timeout: {url} (timeout: {timeout} seconds)")
         return False, None
     except requests.exceptions.ConnectionError as e:
-        print(f"❌ Connection error: {url} - {e}")
+        _emit(f"❌ Connection error: {url} - {e}")
         return False, None
     except Exception as e:
-        print(f"❌ Request exception: {url} - {e}")
+        _emit(f"❌ Request exception: {url} - {e}")
         return False, None
 
+@_batched
 def check_local_port(port, host="0.0.0.0"):
     """Check if local port is available"""
-    print(f"🔌 Checking local port: {host}:{port}")
+    _emit(f"🔌 Checking local port: {host}:{port}")
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.bind((host, port))
         sock.close()
-        print(f"✅ Local port available: {host}:{port}")
+        _emit(f"✅ Local port available: {host}:{port}")
         return True
     except Exception as e:
-        print(f"❌ Local port unavailable: {host}:{port} - {e}")
+        _emit(f"❌ Local port unavailable: {host}:{port} - {e}")
         return False
 
+@_batched
 def check_environment_variables():
     """Check environment variables"""
-    print("🔧 Checking environment variables:")
+    _emit("🔧 Checking environment variables:")
     
     required_vars = {
         'NACOS_SERVER': 'Nacos server address',
@@ -159,152 +339,192 @@ def check_environment_variables():
         'NODE': 'Node identifier'
     }
     
+    env = os.environ
     all_good = True
     
     for var, desc in required_vars.items():
-        value = os.getenv(var)
+        value = env.get(var)
         if value:
-            print(f"✅ {var}: {value} ({desc})")
+            _emit(f"✅ {var}: {value} ({desc})")
         else:
-            print(f"❌ {var}: Not set ({desc}) - Required")
+            _emit(f"❌ {var}: Not set ({desc}) - Required")
             all_good = False
     
     for var, desc in optional_vars.items():
-        value = os.getenv(var)
+        value = env.get(var)
         if value:
-            print(f"ℹ️  {var}: {value} ({desc})")
+            _emit(f"ℹ️  {var}: {value} ({desc})")
         else:
-            print(f"⚠️  {var}: Not set ({desc}) - Optional")
+            _emit(f"⚠️  {var}: Not set ({desc}) - Optional")
     
     return all_good
 
+class NacosServer(NamedTuple):
+    scheme: str
+    host: str
+    port: int
+    url: str
+
+@functools.lru_cache(maxsize=32)
+def _parse_one(server):
+    """Parse a single (already stripped) server address"""
+    # Add protocol prefix
+    if '://' not in server:
+        server = f"http://{server}"
+    
+    parsed = urlparse(server)
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    return NacosServer(parsed.scheme, parsed.hostname, port, server)
+
 def parse_nacos_server(server_str):
-    """Parse Nacos server address"""
+    """Parse Nacos server address (comma-separated) into NacosServer entries"""
     if not server_str:
         return []
     
-    servers = []
-    for server in server_str.split(','):
-        server = server.strip()
-        if not server:
-            continue
-            
-        # Add protocol prefix
-        if '://' not in server:
-            server = f"http://{server}"
-        
-        parsed = urlparse(server)
-        host = parsed.hostname
-        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
-        servers.append((parsed.scheme, host, port, server))
-    
-    return servers
+    return [_parse_one(s) for s in (s.strip() for s in server_str.split(',')) if s]
 
-def main():
-    print("🚀 Nacos network connectivity check tool")
-    print("=" * 50)
-    
-    # Check environment variables
-    env_ok = check_environment_variables()
-    print()
+def _check_one_server(server, deep=False, tcp_results=None):
+    """
+    Reachability -> instance list for one server; True if all passed.
+    deep=True runs the separate DNS -> TCP -> health-endpoints checks instead,
+    taking the TCP result from tcp_results (see probe_tcp_many) when given
+    """
+    host, port, full_url = server.host, server.port, server.url
+    _emit(f"🔍 Checking server: {full_url}")
+    _emit("-" * 30)
     
-    if not env_ok:
-        print("❌ Environment variable check failed, please set required environment variables")
-        sys.exit(1)
+    if deep:
+        tcp_result = tcp_results.get((host, port)) if tcp_results else None
+        http_ok = _deep_check(host, port, full_url, tcp_result)
+        if http_ok is None:
+            return False
+    else:
+        # One request covers DNS, TCP and HTTP
+        if not check_reachable(full_url):
+            return False
+        http_ok = True
     
-    # Get Nacos server address
-    nacos_server = os.getenv("NACOS_SERVER", "http://nacos.hyperagi.network:80")
-    print(f"🎯 Target Nacos server: {nacos_server}")
-    print()
+    # Get service instance list
+    _emit("📋 Testing service instance list retrieval:")
+    instance_success, instance_data = get_nacos_instance_list(full_url, "test", timeout=8)
     
-    # Parse server address
-    servers = parse_nacos_server(nacos_server)
-    if not servers:
-        print("❌ Unable to parse Nacos server address")
-        sys.exit(1)
+    _emit()
+    return http_ok and instance_success
+
+def _deep_check(host, port, full_url, tcp_result=None):
+    """Separate DNS, TCP and health-endpoint checks; None if DNS or TCP failed"""
+    # DNS resolution
+    dns_ok, ips = check_dns_resolution(host)
+    if not dns_ok:
+        return None
     
-    # Check each server
-    overall_success = True
+    # TCP connection (already checked by main() when tcp_result is given)
+    if tcp_result is None:
+        tcp_ok = check_tcp_connection(host, port)
+    else:
+        tcp_ok, lines = tcp_result
+        for line in lines:
+            _emit(line)
+    if not tcp_ok:
+        return None
     
-    for scheme, host, port, full_url in servers:
-        print(f"🔍 Checking server: {full_url}")
-        print("-" * 30)
-        
-        # DNS resolution
-        dns_ok, ips = check_dns_resolution(host)
-        if not dns_ok:
-            overall_success = False
-            continue
+    # HTTP endpoint check
+    return check_nacos_health_endpoints(full_url)
+
+def main(deep=False):
+    # Output is written section by section so progress shows while checks run
+    with _section():
+        _emit("🚀 Nacos network connectivity check tool")
+        _emit("=" * 50)
         
-        # TCP connection
-        tcp_ok = check_tcp_connection(host, port)
-        if not tcp_ok:
-            overall_success = False
-            continue
+        # Check environment variables
+        env_ok = check_environment_variables()
+        _emit()
         
-        # HTTP endpoint check
-        http_ok = check_nacos_health_endpoints(full_url)
-        if not http_ok:
-            overall_success = False
+        if not env_ok:
+            _emit("❌ Environment variable check failed, please set required environment variables")
+            sys.exit(1)
         
-        # Get service instance list
-        print("📋 Testing service instance list retrieval:")
-        instance_success, instance_data = get_nacos_instance_list(full_url, "test", timeout=8)
-        if not instance_success:
-            overall_success = False
+        # Get Nacos server address
+        env = os.environ
+        nacos_server = env.get("NACOS_SERVER", "http://nacos.hyperagi.network:80")
+        _emit(f"🎯 Target Nacos server: {nacos_server}")
+        _emit()
         
-        print()
+        # Parse server address
+        servers = parse_nacos_server(nacos_server)
+        if not servers:
+            _emit("❌ Unable to parse Nacos server address")
+            sys.exit(1)
     
-    # Check local port
-    port = int(os.getenv("PORT", 11434))
-    local_port_ok = check_local_port(port)
-    if not local_port_ok:
-        overall_success = False
+    # Deep mode: check every server's TCP port concurrently up front
+    tcp_results = probe_tcp_many([(s.host, s.port) for s in servers]) if deep else None
     
-    print("=" * 50)
-    if overall_success:
-        print("🎉 All checks passed! Network connectivity is normal")
-        print("💡 If registration still fails, please check:")
-        print("   - Nacos server authentication configuration")
-        print("   - Firewall settings")
-        print("   - Proxy settings")
-        print("   - Whether service name already exists")
-    else:
-        print("❌ Check found issues, please fix according to error messages above")
-        print("💡 Common solutions:")
-        print("   - Check network connection")
-        print("   - Confirm Nacos server address is correct")
-        print("   - Check if firewall is blocking connections")
-        print("   - Try using different ports")
+    # Check all servers concurrently; each server's report is printed as one block, in
+    # order, as soon as it (and the ones before it) finish.
+    # Server checks submit their own health-endpoint probes to the same pool, so at
+    # most half the workers run server checks at a time and the rest stay free for those
+    step = max(1, _MAX_WORKERS // 2)
+    overall_success = True
+    for i in range(0, len(servers), step):
+        for ok, lines in _executor().map(lambda server: _captured(_check_one_server, server, deep, tcp_results),
+                                         servers[i:i + step]):
+            _emit("\n".join(lines))
+            overall_success = overall_success and ok
+    
+    with _section():
+        # Check local port
+        port = int(env.get("PORT", 11434))
+        local_port_ok = check_local_port(port)
+        if not local_port_ok:
+            overall_success = False
+        
+        _emit("=" * 50)
+        if overall_success:
+            _emit("🎉 All checks passed! Network connectivity is normal")
+            _emit("💡 If registration still fails, please check:")
+            _emit("   - Nacos server authentication configuration")
+            _emit("   - Firewall settings")
+            _emit("   - Proxy settings")
+            _emit("   - Whether service name already exists")
+        else:
+            _emit("❌ Check found issues, please fix according to error messages above")
+            _emit("💡 Common solutions:")
+            _emit("   - Check network connection")
+            _emit("   - Confirm Nacos server address is correct")
+            _emit("   - Check if firewall is blocking connections")
+            _emit("   - Try using different ports")
 
 def test_nacos_instance_list():
     """Test Nacos instance list interface"""
-    print("🧪 Testing Nacos instance list interface")
-    print("=" * 50)
-    
     # Use specified URL
     base_url = "http://nacos.hyperagi.network"
     service_name = "test"
     
-    print(f"🎯 Target server: {base_url}")
-    print(f"📋 Service name: {service_name}")
-    print()
+    with _section():
+        _emit("🧪 Testing Nacos instance list interface")
+        _emit("=" * 50)
+        _emit(f"🎯 Target server: {base_url}")
+        _emit(f"📋 Service name: {service_name}")
+        _emit()
     
     # Call function to get instance list
-    success, data = get_nacos_instance_list(base_url, service_name, timeout=8)
+    with _section():
+        success, data = get_nacos_instance_list(base_url, service_name, timeout=8)
     
-    print("=" * 50)
-    if success:
-        print("🎉 Interface call successful!")
-        if data:
-            print("📊 Returned data:")
-            print(data)
-    else:
-        print("❌ Interface call failed!")
-        print("💡 Please check:")
-        print("   - Whether network connection is normal")
-        print("   - Whether Nacos server is accessible")
-        print("   - Whether service name is correct")
+    with _section():
+        _emit("=" * 50)
+        if success:
+            _emit("🎉 Interface call successful!")
+            if data:
+                _emit("📊 Returned data:")
+                _emit(str(data))
+        else:
+            _emit("❌ Interface call failed!")
+            _emit("💡 Please check:")
+            _emit("   - Whether network connection is normal")
+            _emit("   - Whether Nacos server is accessible")
+            _emit("   - Whether service name is correct")
 
 if __name__ == "__main__":
     import sys
@@ -314,5 +534,5 @@ if __name__ == "__main__":
         # Run test mode
         test_nacos_instance_list()
     else:
-        # Run complete check
-        main()
+        # Run complete check (--deep: separate DNS/TCP/health-endpoint checks per server)
+        main(deep="--deep" in sys.argv[1:])
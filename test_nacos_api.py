@@ -3,10 +3,24 @@
 Simple Nacos API test script
 Corresponds to curl command: curl -svm 8 "http://nacos.hyperagi.network/nacos/v1/ns/instance/list?serviceName=test"
 """
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import os
 import sys
 
+# One pooled keep-alive session for every request in this script
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+# VERBOSE=true also prints the full parsed JSON response
+VERBOSE = os.getenv("VERBOSE", "false").lower() in ("1", "true", "yes")
+
+_INSTANCE_FIELDS = ('ip', 'port', 'healthy', 'enabled', 'weight')
+
 
 def test_nacos_api():
     """Test Nacos API call"""
@@ -25,7 +39,7 @@ def test_nacos_api():
     
     try:
         # Send GET request with 8-second timeout (corresponds to curl's -m 8 parameter)
-        response = requests.get(url, params=params, timeout=8)
+        response = _SESSION.get(url, params=params, timeout=8)
         
         print(f"📊 Response status code: {response.status_code}")
         print(f"📋 Response headers:")
@@ -35,27 +49,29 @@ def test_nacos_api():
         
         if response.status_code == 200:
             try:
-                # Try to parse JSON response
-                data = response.json()
+                # Try to parse JSON response (straight from the body bytes)
+                data = json.loads(response.content)
                 print("✅ Request successful!")
-                print(f"📄 JSON response content:")
-                print(json.dumps(data, indent=2, ensure_ascii=False))
+                if VERBOSE:
+                    print(f"📄 JSON response content:")
+                    print(json.dumps(data, indent=2, ensure_ascii=False))
                 
                 # If there's instance data, show detailed information
                 if 'hosts' in data and isinstance(data['hosts'], list):
                     instances = data['hosts']
                     print(f"\n📊 Found {len(instances)} service instances:")
                     for i, instance in enumerate(instances, 1):
-                        print(f"   {i}. IP: {instance.get('ip', 'N/A')}")
-                        print(f"      Port: {instance.get('port', 'N/A')}")
-                        print(f"      Health status: {instance.get('healthy', 'N/A')}")
-                        print(f"      Enabled status: {instance.get('enabled', 'N/A')}")
-                        print(f"      Weight: {instance.get('weight', 'N/A')}")
+                        ip, port, healthy, enabled, weight = (instance.get(k, 'N/A') for k in _INSTANCE_FIELDS)
+                        print(f"   {i}. IP: {ip}")
+                        print(f"      Port: {port}")
+                        print(f"      Health status: {healthy}")
+                        print(f"      Enabled status: {enabled}")
+                        print(f"      Weight: {weight}")
                         if 'metadata' in instance:
                             print(f"      Metadata: {instance['metadata']}")
                         print()
                         
-            except json.JSONDecodeError:
+            except ValueError:
                 print("⚠️  Response is not valid JSON format")
                 print(f"📄 Raw response content:")
                 print(response.text)
@@ -78,35 +94,46 @@ def test_nacos_api():
         print(f"❌ Unknown error: {e}")
 
 
+def _probe_service_name(service_name):
+    """Query one service name; returns the lines to print"""
+    lines = [f"\n📋 Testing service name: {service_name}", "-" * 30]
+    
+    url = "http://nacos.hyperagi.network/nacos/v1/ns/instance/list"
+    params = {'serviceName': service_name}
+    
+    try:
+        response = _SESSION.get(url, params=params, timeout=5)
+        
+        if response.status_code == 200:
+            hosts = json.loads(response.content).get('hosts')
+            if hosts:
+                lines.append(f"✅ Found {len(hosts)} instances")
+            else:
+                lines.append("ℹ️  No instances found")
+        else:
+            lines.append(f"❌ HTTP {response.status_code}")
+            
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+    return lines
+
+
+async def _sweep_service_names(service_names):
+    # Blocking requests calls run concurrently on worker threads, sharing _SESSION's pool
+    return await asyncio.gather(*(asyncio.to_thread(_probe_service_name, name) for name in service_names))
+
+
 def test_with_different_service_names():
-    """Test different service names"""
+    """Test different service names (queried concurrently)"""
     
     service_names = ['test', 'default', 'nacos', 'service']
     
     print("\n🔍 Testing different service names")
     print("=" * 50)
     
-    for service_name in service_names:
-        print(f"\n📋 Testing service name: {service_name}")
-        print("-" * 30)
-        
-        url = "http://nacos.hyperagi.network/nacos/v1/ns/instance/list"
-        params = {'serviceName': service_name}
-        
-        try:
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'hosts' in data and data['hosts']:
-                    print(f"✅ Found {len(data['hosts'])} instances")
-                else:
-                    print("ℹ️  No instances found")
-            else:
-                print(f"❌ HTTP {response.status_code}")
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    # Print each result block in the original order once all queries finish
+    for lines in asyncio.run(_sweep_service_names(service_names)):
+        print("\n".join(lines))
 
 
 if __name__ == "__main__":
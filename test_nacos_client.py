@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Unit tests for nacos_client's retry timing (no Nacos server needed)
+Run: python -m unittest test_nacos_client
+"""
+import unittest
+from unittest import mock
+
+import nacos_client
+
+
+class HeartbeatDelayTest(unittest.TestCase):
+
+    def test_healthy_interval_is_jittered_around_heartbeat_interval(self):
+        with mock.patch.object(nacos_client, "HEARTBEAT_INTERVAL", 5):
+            for _ in range(100):
+                self.assertTrue(4.5 <= nacos_client.heartbeat_delay(0) <= 5.5)
+
+    def test_failures_back_off_beyond_heartbeat_interval(self):
+        with mock.patch.object(nacos_client, "HEARTBEAT_INTERVAL", 5):
+            delays = [nacos_client.heartbeat_delay(fail) for fail in (1, 2)]
+        self.assertEqual(delays, [10, 20])
+
+    def test_backoff_is_capped_at_60s(self):
+        with mock.patch.object(nacos_client, "HEARTBEAT_INTERVAL", 20):
+            self.assertEqual(nacos_client.heartbeat_delay(2), 60)
+            self.assertEqual(nacos_client.heartbeat_delay(10), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,15 @@ Simple script for testing Nacos instance list API
 Corresponds to curl command: curl -svm 8 "http://nacos.hyperagi.network/nacos/v1/ns/instance/list?serviceName=test"
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+# One pooled keep-alive session for every request in this script
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
 def test_nacos_instance_list():
     """Test Nacos instance list interface"""
     url = "http://nacos.hyperagi.network/nacos/v1/ns/instance/list"
@@ -22,7 +29,7 @@ def test_nacos_instance_list():
     
     try:
         # Send GET request with 8-second timeout
-        response = requests.get(url, params=params, timeout=8)
+        response = _SESSION.get(url, params=params, timeout=8)
         
         print(f"✅ Request successful!")
         print(f"📊 Status code: {response.status_code}")
@@ -4,12 +4,19 @@ Nacos API test script using urllib
 Corresponds to curl command: curl -svm 8 "http://nacos.hyperagi.network/nacos/v1/ns/instance/list?serviceName=test"
 No additional dependencies required, uses Python standard library
 """
+import asyncio
 import urllib.request
 import urllib.parse
 import urllib.error
 import json
+import os
 import sys
 
+# VERBOSE=true also prints the full parsed JSON response
+VERBOSE = os.getenv("VERBOSE", "false").lower() in ("1", "true", "yes")
+
+_INSTANCE_FIELDS = ('ip', 'port', 'healthy', 'enabled', 'weight')
+
 
 def test_nacos_api():
     """Test Nacos API call"""
@@ -49,19 +56,21 @@ def test_nacos_api():
                     # Try to parse JSON response
                     data = json.loads(response_data)
                     print("✅ Request successful!")
-                    print(f"📄 JSON response content:")
-                    print(json.dumps(data, indent=2, ensure_ascii=False))
+                    if VERBOSE:
+                        print(f"📄 JSON response content:")
+                        print(json.dumps(data, indent=2, ensure_ascii=False))
                     
                     # If there's instance data, show detailed information
                     if 'hosts' in data and isinstance(data['hosts'], list):
                         instances = data['hosts']
                         print(f"\n📊 Found {len(instances)} service instances:")
                         for i, instance in enumerate(instances, 1):
-                            print(f"   {i}. IP: {instance.get('ip', 'N/A')}")
-                            print(f"      Port: {instance.get('port', 'N/A')}")
-                            print(f"      Health status: {instance.get('healthy', 'N/A')}")
-                            print(f"      Enabled status: {instance.get('enabled', 'N/A')}")
-                            print(f"      Weight: {instance.get('weight', 'N/A')}")
+                            ip, port, healthy, enabled, weight = (instance.get(k, 'N/A') for k in _INSTANCE_FIELDS)
+                            print(f"   {i}. IP: {ip}")
+                            print(f"      Port: {port}")
+                            print(f"      Health status: {healthy}")
+                            print(f"      Enabled status: {enabled}")
+                            print(f"      Weight: {weight}")
                             if 'metadata' in instance:
                                 print(f"      Metadata: {instance['metadata']}")
                             print()
@@ -93,38 +102,49 @@ def test_nacos_api():
         print(f"❌ Unknown error: {e}")
 
 
+def _probe_service_name(service_name):
+    """Query one service name; returns the lines to print"""
+    lines = [f"\n📋 Testing service name: {service_name}", "-" * 30]
+    
+    base_url = "http://nacos.hyperagi.network/nacos/v1/ns/instance/list"
+    params = {'serviceName': service_name}
+    url = f"{base_url}?{urllib.parse.urlencode(params)}"
+    
+    try:
+        req = urllib.request.Request(url)
+        req.add_header('User-Agent', 'NacosAPITest/1.0')
+        
+        with urllib.request.urlopen(req, timeout=5) as response:
+            if response.status == 200:
+                data = json.loads(response.read().decode('utf-8'))
+                if 'hosts' in data and data['hosts']:
+                    lines.append(f"✅ Found {len(data['hosts'])} instances")
+                else:
+                    lines.append("ℹ️  No instances found")
+            else:
+                lines.append(f"❌ HTTP {response.status}")
+                
+    except Exception as e:
+        lines.append(f"❌ Error: {e}")
+    return lines
+
+
+async def _sweep_service_names(service_names):
+    # urllib is blocking: run the queries concurrently on worker threads
+    return await asyncio.gather(*(asyncio.to_thread(_probe_service_name, name) for name in service_names))
+
+
 def test_with_different_service_names():
-    """Test different service names"""
+    """Test different service names (queried concurrently)"""
     
     service_names = ['test', 'default', 'nacos', 'service']
     
     print("\n🔍 Testing different service names")
     print("=" * 50)
     
-    for service_name in service_names:
-        print(f"\n📋 Testing service name: {service_name}")
-        print("-" * 30)
-        
-        base_url = "http://nacos.hyperagi.network/nacos/v1/ns/instance/list"
-        params = {'serviceName': service_name}
-        url = f"{base_url}?{urllib.parse.urlencode(params)}"
-        
-        try:
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'NacosAPITest/1.0')
-            
-            with urllib.request.urlopen(req, timeout=5) as response:
-                if response.status == 200:
-                    data = json.loads(response.read().decode('utf-8'))
-                    if 'hosts' in data and data['hosts']:
-                        print(f"✅ Found {len(data['hosts'])} instances")
-                    else:
-                        print("ℹ️  No instances found")
-                else:
-                    print(f"❌ HTTP {response.status}")
-                    
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    # Print each result block in the original order once all queries finish
+    for lines in asyncio.run(_sweep_service_names(service_names)):
+        print("\n".join(lines))
 
 
 if __name__ == "__main__":
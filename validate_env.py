@@ -6,14 +6,20 @@ Used to validate environment variable configuration required by Nacos client
 import os
 import sys
 import re
-from eth_utils import is_address
+import ipaddress
+
+# 校验用正则在模块加载时编译一次
+_NAME_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+_URL_RE = re.compile(r'^https?://[a-zA-Z0-9.-]+(:\d+)?(/.*)?$')
+# 与 eth_utils.is_address 对文本地址的判断一致：可选 0x 前缀 + 40位十六进制，不校验 EIP-55 校验和
+_ADDR_RE = re.compile(r'(0[xX])?[0-9a-fA-F]{40}')
 
 def validate_wallet_address(address):
     """验证以太坊钱包地址"""
     if not address:
         return False, "钱包地址为空"
     
-    if not is_address(address):
+    if not _ADDR_RE.fullmatch(address):
         return False, f"无效的钱包地址格式: {address}"
     
     return True, "钱包地址格式正确"
@@ -23,17 +29,12 @@ def validate_ip_address(ip):
     if not ip:
         return False, "IP地址为空"
     
-    # IPv4验证
-    ipv4_pattern = r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-    if re.match(ipv4_pattern, ip):
-        return True, "IPv4地址格式正确"
-    
-    # IPv6验证（简化版）
-    ipv6_pattern = r'^(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$'
-    if re.match(ipv6_pattern, ip):
-        return True, "IPv6地址格式正确"
-    
-    return False, f"无效的IP地址格式: {ip}"
+    # ipaddress 同时支持IPv4和完整/压缩形式的IPv6（如 ::1、fe80::1）
+    try:
+        version = ipaddress.ip_address(ip).version
+    except ValueError:
+        return False, f"无效的IP地址格式: {ip}"
+    return True, f"IPv{version}地址格式正确"
 
 def validate_port(port_str):
     """验证端口号"""
@@ -55,7 +56,7 @@ def validate_service_name(name):
         return False, "服务名称为空"
     
     # 服务名称应该只包含字母、数字、连字符和下划线
-    if re.match(r'^[a-zA-Z0-9_-]+$', name):
+    if _NAME_RE.match(name):
         return True, "服务名称格式正确"
     else:
         return False, f"服务名称包含无效字符: {name} (只允许字母、数字、连字符和下划线)"
@@ -74,15 +75,15 @@ def validate_nacos_server(server):
             srv = f"http://{srv}"
         
         # 简单的URL格式验证
-        if not re.match(r'^https?://[a-zA-Z0-9.-]+(:\d+)?(/.*)?$', srv):
+        if not _URL_RE.match(srv):
             return False, f"无效的Nacos服务器地址格式: {srv}"
     
     return True, f"Nacos服务器地址格式正确: {len(servers)}个服务器"
 
-def validate_nacos_credentials():
+def validate_nacos_credentials(env=os.environ):
     """验证Nacos认证信息"""
-    username = os.getenv("NACOS_USERNAME", "")
-    password = os.getenv("NACOS_PASSWORD", "")
+    username = env.get("NACOS_USERNAME", "")
+    password = env.get("NACOS_PASSWORD", "")
     
     if not username and not password:
         return True, "未设置认证信息（使用匿名访问）"
@@ -96,7 +97,7 @@ def validate_nacos_group(group):
     if not group:
         return True, "使用默认分组"
     
-    if re.match(r'^[a-zA-Z0-9_-]+$', group):
+    if _NAME_RE.match(group):
         return True, "分组名称格式正确"
     else:
         return False, f"分组名称包含无效字符: {group}"
@@ -106,12 +107,12 @@ def validate_nacos_cluster(cluster):
     if not cluster:
         return True, "未设置集群（使用默认集群）"
     
-    if re.match(r'^[a-zA-Z0-9_-]+$', cluster):
+    if _NAME_RE.match(cluster):
         return True, "集群名称格式正确"
     else:
         return False, f"集群名称包含无效字符: {cluster}"
 
-def validate_timeout_settings():
+def validate_timeout_settings(env=os.environ):
     """验证超时设置"""
     timeout_vars = {
         'NACOS_HTTP_TIMEOUT': 'HTTP超时时间',
@@ -124,7 +125,7 @@ def validate_timeout_settings():
     all_valid = True
     
     for var, desc in timeout_vars.items():
-        value = os.getenv(var, "")
+        value = env.get(var, "")
         if not value:
             results.append(f"ℹ️  {var}: 使用默认值 ({desc})")
             continue
@@ -142,50 +143,55 @@ def validate_timeout_settings():
     
     return all_valid, results
 
+# 必需的环境变量
+_REQUIRED = (
+    ('WALLET_ADDRESS', validate_wallet_address),
+    ('PUBLIC_IP', validate_ip_address),
+    ('SERVICE_NAME', validate_service_name),
+    ('NACOS_SERVER', validate_nacos_server),
+    ('PORT', validate_port),
+)
+
+# 可选的环境变量
+_OPTIONAL = (
+    ('NACOS_GROUP', validate_nacos_group),
+    ('NACOS_CLUSTER', validate_nacos_cluster),
+    ('NODE', lambda x: (True, f"节点标识: {x}" if x else "使用PUBLIC_IP作为节点标识")),
+)
+
+def run_validations(env, table):
+    """对 table 中每个 (变量名, 校验函数) 执行校验，返回 [(变量名, 值, 是否有效, 消息)]"""
+    results = []
+    for var, validator in table:
+        value = env.get(var, "")
+        results.append((var, value, *validator(value)))
+    return results
+
 def main():
     print("🔧 Nacos环境变量验证工具")
     print("=" * 50)
     
-    # 必需的环境变量
-    required_vars = {
-        'WALLET_ADDRESS': validate_wallet_address,
-        'PUBLIC_IP': validate_ip_address,
-        'SERVICE_NAME': validate_service_name,
-        'NACOS_SERVER': validate_nacos_server,
-        'PORT': validate_port
-    }
-    
-    # 可选的环境变量
-    optional_vars = {
-        'NACOS_GROUP': validate_nacos_group,
-        'NACOS_CLUSTER': validate_nacos_cluster,
-        'NODE': lambda x: (True, f"节点标识: {x}" if x else "使用PUBLIC_IP作为节点标识")
-    }
-    
+    # 环境变量只读取一次快照，所有检查共用
+    env = dict(os.environ)
     all_valid = True
     
     print("📋 检查必需的环境变量:")
     print("-" * 30)
     
-    for var, validator in required_vars.items():
-        value = os.getenv(var, "")
-        if value:
-            is_valid, message = validator(value)
-            if is_valid:
-                print(f"✅ {var}: {message}")
-            else:
-                print(f"❌ {var}: {message}")
-                all_valid = False
-        else:
+    for var, value, is_valid, message in run_validations(env, _REQUIRED):
+        if not value:
             print(f"❌ {var}: 未设置")
             all_valid = False
+        elif is_valid:
+            print(f"✅ {var}: {message}")
+        else:
+            print(f"❌ {var}: {message}")
+            all_valid = False
     
     print("\n📋 检查可选的环境变量:")
     print("-" * 30)
     
-    for var, validator in optional_vars.items():
-        value = os.getenv(var, "")
-        is_valid, message = validator(value)
+    for var, value, is_valid, message in run_validations(env, _OPTIONAL):
         if is_valid:
             print(f"ℹ️  {var}: {message}")
         else:
@@ -194,7 +200,7 @@ def main():
     print("\n🔐 检查认证配置:")
     print("-" * 30)
     
-    cred_valid, cred_message = validate_nacos_credentials()
+    cred_valid, cred_message = validate_nacos_credentials(env)
     if cred_valid:
         print(f"✅ 认证配置: {cred_message}")
     else:
@@ -204,7 +210,7 @@ def main():
     print("\n⏱️  检查超时设置:")
     print("-" * 30)
     
-    timeout_valid, timeout_results = validate_timeout_settings()
+    timeout_valid, timeout_results = validate_timeout_settings(env)
     for result in timeout_results:
         print(result)
     
@@ -226,7 +232,7 @@ def main():
         ]
         
         for var in config_vars:
-            value = os.getenv(var, "")
+            value = env.get(var, "")
             if value:
                 # 敏感信息脱敏
                 if 'PASSWORD' in var: